@@ -2,20 +2,114 @@
 Data export utilities for multiple formats
 """
 
+import csv
+import datetime
 import json
 import logging
-from typing import List, Dict, Any
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence
 from io import BytesIO, StringIO
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("DataExporter")
 
 
+def to_json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, stringifying values JSON can't represent (datetimes, ...)"""
+    if orjson is not None:
+        # Non-string keys are stringified the way json.dumps does it
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, default=str, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+# Longest string Excel stores in a cell
+EXCEL_MAX_CELL_LENGTH = 32767
+
+_EXCEL_SCALARS = (str, bool, int, float, datetime.date, datetime.time, datetime.timedelta)
+
+
+def _excel_cell(value: Any) -> Any:
+    """Map a row value to something xlsxwriter writes without dropping it"""
+    if value is None:
+        return None
+    if not isinstance(value, _EXCEL_SCALARS):
+        # Lists, dicts, ... are written as their text like pandas does
+        value = str(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        # Empty cell for NaN, 'inf'/'-inf' text like pandas' default inf_rep
+        return None if math.isnan(value) else str(value)
+    if isinstance(value, str) and len(value) > EXCEL_MAX_CELL_LENGTH:
+        logger.warning("Truncating %d-character value to Excel's %d-character cell limit",
+                       len(value), EXCEL_MAX_CELL_LENGTH)
+        return value[:EXCEL_MAX_CELL_LENGTH]
+    return value
+
+
 class DataExporter:
     """Export data in various formats"""
     
     @staticmethod
-    def export_to_csv(data: List[Dict[str, Any]]) -> str:
+    def export_to_csv(data: List[Dict[str, Any]], use_pandas: bool = False) -> str:
         """Export data to CSV format"""
+        if use_pandas:
+            return DataExporter._export_to_csv_pandas(data)
+        
+        try:
+            if not data:
+                return ""
+            
+            csv_string = b"".join(DataExporter.iter_csv_chunks(data)).decode("utf-8")
+            logger.info("✓ Exported %d rows to CSV", len(data))
+            return csv_string
+            
+        except Exception as e:
+            logger.error("CSV export failed: %s", e)
+            raise
+    
+    @staticmethod
+    def iter_csv_chunks(data: Iterable[Dict[str, Any]], chunk_size: int = 10000,
+                        fieldnames: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+        """Export data to CSV format as UTF-8 chunks of up to chunk_size rows.
+        
+        With fieldnames given, data can be any iterable (e.g. a generator) and
+        is consumed one chunk at a time; otherwise it must be a list.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        
+        if fieldnames is None:
+            if not data:
+                return
+            fieldnames = DataExporter._fieldnames(data)
+        
+        buffer = StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator="\n")
+        writer.writeheader()
+        
+        rows = iter(data)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            writer.writerows(chunk)
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate(0)
+            if len(chunk) < chunk_size:
+                break
+    
+    @staticmethod
+    def _export_to_csv_pandas(data: List[Dict[str, Any]]) -> str:
+        """Export data to CSV format using pandas"""
         try:
             import pandas as pd
             
@@ -24,72 +118,236 @@ class DataExporter:
             
             df = pd.DataFrame(data)
             csv_string = df.to_csv(index=False)
-            logger.info(f"✓ Exported {len(data)} rows to CSV")
+            logger.info("✓ Exported %d rows to CSV", len(data))
             return csv_string
             
         except ImportError:
             logger.error("pandas not installed. Install with: pip install pandas")
             raise
         except Exception as e:
-            logger.error(f"CSV export failed: {str(e)}")
+            logger.error("CSV export failed: %s", e)
             raise
     
     @staticmethod
-    def export_to_excel(data: List[Dict[str, Any]]) -> bytes:
-        """Export data to Excel format"""
+    def export_to_excel(data: Iterable[Dict[str, Any]],
+                        fieldnames: Optional[Sequence[str]] = None) -> BytesIO:
+        """Export data to Excel format, returning the in-memory workbook buffer.
+        
+        With fieldnames given, data can be any iterable of rows; otherwise it must be a list.
+        """
         try:
-            import pandas as pd
+            import xlsxwriter
+            
+            if fieldnames is None:
+                if not data:
+                    return BytesIO()
+                fieldnames = DataExporter._fieldnames(data)
+            
+            # constant_memory flushes each row to disk as it is written
+            # instead of keeping the whole sheet in memory; URLs stay plain
+            # text so long ones and the per-sheet hyperlink limit don't drop cells
+            output = BytesIO()
+            workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'strings_to_urls': False})
+            worksheet = workbook.add_worksheet('Data')
+            worksheet.write_row(0, 0, fieldnames)
+            count = 0
+            for count, row in enumerate(data, 1):
+                # write_row stops at the first cell it can't write, so don't
+                # let a failure silently drop the rest of the row
+                if worksheet.write_row(count, 0, [_excel_cell(row.get(k)) for k in fieldnames]):
+                    raise ValueError(f"Could not write row {count} to Excel")
+            workbook.close()
+            
+            output.seek(0)
+            logger.info("✓ Exported %d rows to Excel", count)
+            return output
+            
+        except ImportError:
+            logger.error("xlsxwriter not installed. Install with: pip install xlsxwriter")
+            raise
+        except Exception as e:
+            logger.error("Excel export failed: %s", e)
+            raise
+    
+    @staticmethod
+    def export_to_excel_bytes(data: Iterable[Dict[str, Any]],
+                              fieldnames: Optional[Sequence[str]] = None) -> bytes:
+        """Export data to Excel format as bytes"""
+        return DataExporter.export_to_excel(data, fieldnames).getvalue()
+    
+    @staticmethod
+    def export_to_parquet(data: List[Dict[str, Any]]) -> bytes:
+        """Export data to Parquet format"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
             
             if not data:
                 return b""
             
-            df = pd.DataFrame(data)
+            table = DataExporter._to_arrow_table(data)
+            output = pa.BufferOutputStream()
+            pq.write_table(table, output, compression='zstd')
             
-            # Create Excel file in memory
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Data')
+            parquet_bytes = output.getvalue().to_pybytes()
+            logger.info("✓ Exported %d rows to Parquet", len(data))
+            return parquet_bytes
             
-            excel_bytes = output.getvalue()
-            logger.info(f"✓ Exported {len(data)} rows to Excel")
-            return excel_bytes
+        except ImportError:
+            logger.error("pyarrow not installed. Install with: pip install pyarrow")
+            raise
+        except Exception as e:
+            logger.error("Parquet export failed: %s", e)
+            raise
+    
+    @staticmethod
+    def export_to_feather(data: List[Dict[str, Any]]) -> bytes:
+        """Export data to Feather (Arrow IPC) format"""
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+            
+            if not data:
+                return b""
+            
+            table = DataExporter._to_arrow_table(data)
+            output = pa.BufferOutputStream()
+            feather.write_feather(table, output, compression='lz4')
+            
+            feather_bytes = output.getvalue().to_pybytes()
+            logger.info("✓ Exported %d rows to Feather", len(data))
+            return feather_bytes
             
         except ImportError:
-            logger.error("pandas or openpyxl not installed. Install with: pip install pandas openpyxl")
+            logger.error("pyarrow not installed. Install with: pip install pyarrow")
             raise
         except Exception as e:
-            logger.error(f"Excel export failed: {str(e)}")
+            logger.error("Feather export failed: %s", e)
             raise
     
+    @staticmethod
+    def export_partitioned(data: List[Dict[str, Any]], by: str, fmt: str) -> Dict[str, bytes]:
+        """Export data as one file per distinct value of the `by` field"""
+        exporters = {
+            "csv": lambda rows: b"".join(DataExporter.iter_csv_chunks(rows)),
+            "excel": DataExporter.export_to_excel_bytes,
+            "parquet": DataExporter.export_to_parquet,
+            "feather": DataExporter.export_to_feather,
+        }
+        export_one = exporters.get(fmt)
+        if export_one is None:
+            raise ValueError(f"Unknown export format: {fmt}")
+        
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for row in data:
+            groups.setdefault(str(row.get(by)), []).append(row)
+        
+        if len(groups) <= 1:
+            return {key: export_one(rows) for key, rows in groups.items()}
+        
+        # Serialization and buffer writes release the GIL often enough for
+        # independent partitions to overlap
+        with ThreadPoolExecutor(max_workers=min(len(groups), os.cpu_count() or 1)) as executor:
+            futures = {key: executor.submit(export_one, rows) for key, rows in groups.items()}
+            partitions = {key: future.result() for key, future in futures.items()}
+        
+        logger.info("✓ Exported %d partitions by %s to %s", len(partitions), by, fmt)
+        return partitions
+    
+    @staticmethod
+    def _to_arrow_table(data: List[Dict[str, Any]]):
+        """Build a pyarrow Table with a column for every key seen in data"""
+        import pyarrow as pa
+        
+        # Table.from_pylist only infers columns from the first row
+        return pa.Table.from_pydict({
+            k: [row.get(k) for row in data] for k in DataExporter._fieldnames(data)
+        })
+    
+    @staticmethod
+    def _fieldnames(data: List[Dict[str, Any]]) -> List[str]:
+        """Union of keys in first-seen order, same column order pandas produces"""
+        first_keys = data[0].keys()
+        # Common case: every row shares the first row's keys, so skip the union
+        if all(row.keys() == first_keys for row in data):
+            return list(first_keys)
+        return list(dict.fromkeys(k for row in data for k in row))
+    
     @staticmethod
     def clean_data(data: List[Dict[str, Any]], 
                    remove_duplicates: bool = False,
                    remove_nulls: bool = False) -> List[Dict[str, Any]]:
         """Clean and process data"""
-        cleaned = data.copy()
+        if not (remove_duplicates or remove_nulls):
+            return data
+        
+        seen = set()
+        cleaned = []
+        
+        # Deduplicate on the full row, then drop null values, in one pass
+        for item in data:
+            if remove_duplicates:
+                key = DataExporter._dedup_key(item)
+                if key in seen:
+                    continue
+                seen.add(key)
+            
+            if remove_nulls:
+                item = {k: v for k, v in item.items() if v is not None and v != ''}
+            
+            cleaned.append(item)
         
-        # Remove duplicates
         if remove_duplicates:
-            seen = set()
-            unique_data = []
-            for item in cleaned:
-                item_str = json.dumps(item, sort_keys=True)
-                if item_str not in seen:
-                    seen.add(item_str)
-                    unique_data.append(item)
-            cleaned = unique_data
-            logger.info(f"✓ Removed {len(data) - len(cleaned)} duplicates")
-        
-        # Remove null values
+            logger.info("✓ Removed %d duplicates", len(data) - len(cleaned))
         if remove_nulls:
-            cleaned = [
-                {k: v for k, v in item.items() if v is not None and v != ''}
-                for item in cleaned
-            ]
             logger.info("✓ Removed null values")
         
         return cleaned
     
+    @staticmethod
+    def _dedup_key(item: Dict[str, Any]) -> Any:
+        """Build the duplicate-detection key for a row, matching json.dumps(sort_keys=True)"""
+        if orjson is not None:
+            try:
+                # Datetimes and dataclasses would otherwise collide with their
+                # string/dict forms; passing them through makes orjson refuse them
+                key = orjson.dumps(item, option=orjson.OPT_SORT_KEYS
+                                   | orjson.OPT_PASSTHROUGH_DATETIME
+                                   | orjson.OPT_PASSTHROUGH_DATACLASS)
+            except TypeError:
+                # Values orjson can't encode (non-str keys, sets, ...)
+                return DataExporter._freeze(item)
+            # orjson writes NaN/inf as null, so only rows with a null need the
+            # slower check before trusting the fast key
+            if b"null" not in key or not DataExporter._has_non_finite(item):
+                return key
+        try:
+            return json.dumps(item, sort_keys=True)
+        except TypeError:
+            return DataExporter._freeze(item)
+    
+    @staticmethod
+    def _has_non_finite(value: Any) -> bool:
+        """Whether a row contains a NaN or infinite float anywhere"""
+        if isinstance(value, float):
+            return not math.isfinite(value)
+        if isinstance(value, dict):
+            return any(DataExporter._has_non_finite(v) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return any(DataExporter._has_non_finite(v) for v in value)
+        return False
+    
+    @staticmethod
+    def _freeze(value: Any) -> Any:
+        """Convert a row into a hashable key for duplicate detection"""
+        if isinstance(value, dict):
+            return frozenset((k, DataExporter._freeze(v)) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return tuple(DataExporter._freeze(v) for v in value)
+        if isinstance(value, set):
+            return frozenset(DataExporter._freeze(v) for v in value)
+        return value
+    
     @staticmethod
     def transform_data(data: List[Dict[str, Any]], 
                       transformations: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -101,27 +359,29 @@ class DataExporter:
         # - trim_fields: ["description"]
         # - extract_domain_from: "email"
         
+        # Resolve the per-field string operations once, applied in order:
+        # lowercase, uppercase, then trim
+        ops: Dict[str, List[Callable[[str], str]]] = {}
+        for key, fn in (("lowercase_fields", str.lower),
+                        ("uppercase_fields", str.upper),
+                        ("trim_fields", str.strip)):
+            for field in transformations.get(key, ()):
+                ops.setdefault(field, []).append(fn)
+        ops_items = tuple((field, tuple(fns)) for field, fns in ops.items())
+        
         transformed = []
         
         for item in data:
-            new_item = item.copy()
-            
-            # Lowercase fields
-            for field in transformations.get("lowercase_fields", []):
-                if field in new_item and isinstance(new_item[field], str):
-                    new_item[field] = new_item[field].lower()
-            
-            # Uppercase fields
-            for field in transformations.get("uppercase_fields", []):
-                if field in new_item and isinstance(new_item[field], str):
-                    new_item[field] = new_item[field].upper()
+            new_item = dict(item)
             
-            # Trim fields
-            for field in transformations.get("trim_fields", []):
-                if field in new_item and isinstance(new_item[field], str):
-                    new_item[field] = new_item[field].strip()
+            for field, fns in ops_items:
+                value = new_item.get(field)
+                if isinstance(value, str):
+                    for fn in fns:
+                        value = fn(value)
+                    new_item[field] = value
             
             transformed.append(new_item)
         
-        logger.info(f"✓ Applied transformations to {len(data)} items")
+        logger.info("✓ Applied transformations to %d items", len(data))
         return transformed
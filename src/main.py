@@ -18,16 +18,19 @@
 # """
 
 import asyncio
-import json
+import hashlib
+import itertools
 import logging
 import re
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, Union
-from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Final, List, Mapping, Optional, Tuple, Union
 from enum import Enum
+from functools import lru_cache
+from urllib.parse import urlsplit
 import base64
 
+import msgspec
 from apify import Actor
 from playwright.async_api import (
     async_playwright,
@@ -40,7 +43,7 @@ from playwright.async_api import (
 )
 
 from .templates import TemplateManager
-from .export import DataExporter
+from .export import DataExporter, to_json_bytes
 
 # ============================================================================
 # LOGGING & CONFIGURATION
@@ -52,6 +55,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger("PlaywrightMCPActor")
 
+# Maximum number of queued action results sent in one dataset push
+PUSH_BATCH_SIZE = 500
+
+# Upper bound (ms) on waiting for network quiet after a navigation
+DEFAULT_SETTLE_MS = 1500
+
+# Seconds a resolved locator is reused for later actions on the same selector
+LOCATOR_CACHE_TTL_S = 2.0
+
+# Maximum number of parallel_groups sequences running at once
+MAX_PARALLEL_GROUPS = 10
+
+# Seconds spent resolving navigate hosts while browsers launch
+DNS_PREWARM_TIMEOUT_S = 2.0
+
+# Analytics and ad URL patterns blocked on Chromium unless block_urls overrides them
+DEFAULT_BLOCKLIST = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*adservice.google.*",
+    "*facebook.net*",
+    "*connect.facebook.com*",
+    "*hotjar.com*",
+    "*segment.io*",
+    "*cdn.segment.com*",
+    "*scorecardresearch.com*",
+    "*quantserve.com*",
+    "*amazon-adsystem.com*",
+    "*taboola.com*",
+    "*outbrain.com*",
+]
+
+# Init script for stealth_mode, added to every new browser context
+_STEALTH_JS: Final[str] = """
+    // Remove webdriver property
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    
+    // Mock plugins
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+    
+    // Mock languages
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    });
+    
+    // Add chrome object
+    window.chrome = {
+        runtime: {}
+    };
+    
+    // Mock permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+        Promise.resolve({ state: Notification.permission }) :
+        originalQuery(parameters)
+    );
+"""
+
 
 class BrowserType(str, Enum):
     """Supported browser types"""
@@ -97,9 +165,19 @@ class SelectorType(str, Enum):
     AUTO = "auto"  # Intelligent detection
 
 
-@dataclass
-@dataclass
-class Action:
+@lru_cache(maxsize=64)
+def _action_type(value: str) -> ActionType:
+    """Cached ActionType lookup for input parsing"""
+    return ActionType(value)
+
+
+@lru_cache(maxsize=64)
+def _selector_type(value: str) -> SelectorType:
+    """Cached SelectorType lookup for input parsing"""
+    return SelectorType(value)
+
+
+class Action(msgspec.Struct):
     """Represents a single automation action"""
     type: ActionType
     selector: Optional[str] = None
@@ -110,11 +188,14 @@ class Action:
     metadata: Optional[Dict] = None
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        result = msgspec.structs.asdict(self)
+        metadata = result["metadata"]
+        if metadata is not None:
+            result["metadata"] = dict(metadata)
+        return result
 
 
-@dataclass
-class ActionResult:
+class ActionResult(msgspec.Struct):
     """Result of executing an action"""
     success: bool
     action: Action
@@ -122,12 +203,20 @@ class ActionResult:
     error: Optional[str] = None
     execution_time_ms: float = 0
     screenshot_base64: Optional[str] = None
-    timestamp: str = ""
+    screenshot_key: Optional[str] = None
+    timestamp_ns: int = 0
+    
+    @property
+    def timestamp(self) -> str:
+        """Wall-clock start time as an ISO string, formatted only when needed"""
+        seconds, ns = divmod(self.timestamp_ns, 1_000_000_000)
+        return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000).isoformat()
     
     def to_dict(self) -> Dict:
         """Convert to dict matching dataset schema (flatten action properties)"""
+        action = self.action
         result = {
-            "type": self.action.type,
+            "type": action.type,
             "success": self.success,
             "execution_time_ms": self.execution_time_ms,
             "output": self.output,
@@ -135,16 +224,25 @@ class ActionResult:
         }
         
         # Add optional fields only if they exist
-        if self.action.selector:
-            result["selector"] = self.action.selector
-        if self.action.value:
-            result["value"] = self.action.value
-        if self.action.description:
-            result["description"] = self.action.description
-        if self.error:
-            result["error"] = self.error
+        selector = action.selector
+        if selector:
+            result["selector"] = selector
+        value = action.value
+        if value:
+            result["value"] = value
+        description = action.description
+        if description:
+            result["description"] = description
+        error = self.error
+        if error:
+            result["error"] = error
+        screenshot_key = self.screenshot_key
+        if screenshot_key:
+            result["has_screenshot"] = True
+            result["screenshot_key"] = screenshot_key
         if self.screenshot_base64:
             result["has_screenshot"] = True
+            result["screenshot_base64"] = self.screenshot_base64
             
         return result
 
@@ -156,6 +254,25 @@ class ActionResult:
 class LocatorStrategy:
     """Intelligent element location with fallback strategies"""
     
+    # AUTO strategy orders, keyed by the strategy tried first
+    _AUTO_ORDER_CACHE: Dict[str, Tuple[str, ...]] = {
+        first: (first,) + tuple(s for s in ("css", "xpath", "text", "role") if s != first)
+        for first in ("css", "xpath", "text", "role")
+    }
+    
+    @staticmethod
+    def _classify(selector: str) -> Tuple[str, str]:
+        """Guess the most likely strategy for a selector and strip any engine prefix"""
+        if selector.startswith(("//", "(", "./", "xpath=")):
+            return "xpath", selector[6:] if selector.startswith("xpath=") else selector
+        if selector.startswith("text="):
+            return "text", selector[5:]
+        if selector.startswith("role="):
+            return "role", selector[5:]
+        if selector.startswith("css="):
+            return "css", selector[4:]
+        return "css", selector
+    
     @staticmethod
     async def find_element(
         page: Page,
@@ -165,45 +282,157 @@ class LocatorStrategy:
     ) -> Optional[Locator]:
         """Find element with intelligent fallback strategies"""
         
-        strategies = []
-        
         # Build strategy list based on selector_type
         if selector_type == SelectorType.AUTO:
-            strategies = [
-                ("css", selector),
-                ("xpath", selector),
-                ("text", selector),
-                ("role", selector),
-            ]
+            first, selector = LocatorStrategy._classify(selector)
+            strategies = LocatorStrategy._AUTO_ORDER_CACHE[first]
         else:
-            strategies = [(selector_type.value, selector)]
+            strategies = (selector_type.value,)
         
-        for strategy_name, strategy_value in strategies:
-            try:
-                logger.info(f"Trying {strategy_name} selector: {strategy_value}")
-                
-                if strategy_name == "css":
-                    locator = page.locator(f"css={strategy_value}")
-                elif strategy_name == "xpath":
-                    locator = page.locator(f"xpath={strategy_value}")
-                elif strategy_name == "text":
-                    locator = page.get_by_text(strategy_value, exact=False)
-                elif strategy_name == "role":
-                    # Try role selector (e.g., "button[name='Submit']")
-                    locator = page.locator(f"role={strategy_value}")
-                else:
-                    continue
-                
-                # Verify element exists and is visible
-                await locator.first.wait_for(state="visible", timeout=timeout)
-                logger.info(f"✓ Found element using {strategy_name}")
-                return locator
+        # Strategies are independent probes of the same page, so run them
+        # concurrently instead of paying one timeout per miss. A match is only
+        # accepted once every higher-ranked probe has finished without one, so
+        # the result is the same as trying the strategies in order.
+        tasks = [
+            asyncio.create_task(
+                LocatorStrategy._probe(page, strategy_name, selector, timeout)
+            )
+            for strategy_name in strategies
+        ]
+        pending = set(tasks)
+        
+        try:
+            while pending:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
                 
-            except (PlaywrightTimeoutError, PlaywrightError) as e:
-                logger.debug(f"✗ {strategy_name} strategy failed: {str(e)}")
-                continue
+                for strategy_name, task in zip(strategies, tasks):
+                    if not task.done():
+                        break
+                    locator = task.result()
+                    if locator is not None:
+                        logger.info("✓ Found element using %s", strategy_name)
+                        return locator
+        finally:
+            for task in pending:
+                task.cancel()
         
         return None
+    
+    @staticmethod
+    async def _probe(page: Page, strategy_name: str, selector: str, timeout: int) -> Optional[Locator]:
+        """Wait for an element using a single strategy"""
+        try:
+            logger.info("Trying %s selector: %s", strategy_name, selector)
+            
+            if strategy_name == "css":
+                locator = page.locator(f"css={selector}")
+            elif strategy_name == "xpath":
+                locator = page.locator(f"xpath={selector}")
+            elif strategy_name == "text":
+                locator = page.get_by_text(selector, exact=False)
+            elif strategy_name == "role":
+                # Try role selector (e.g., "button[name='Submit']")
+                locator = page.locator(f"role={selector}")
+            else:
+                return None
+            
+            # Verify element exists and is visible
+            await locator.first.wait_for(state="visible", timeout=timeout)
+            return locator
+            
+        except (PlaywrightTimeoutError, PlaywrightError) as e:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("✗ %s strategy failed: %s", strategy_name, e)
+            return None
+
+
+# ============================================================================
+# BROWSER POOL - REUSES LAUNCHED BROWSERS ACROSS CONTROLLERS
+# ============================================================================
+
+class BrowserPool:
+    """Shares launched browsers between controllers with matching launch options"""
+    
+    # Seconds an unused browser is kept alive before it is closed
+    IDLE_TTL_S = 60
+    
+    _playwright = None
+    _lock: Optional[asyncio.Lock] = None
+    _browsers: Dict[Tuple, Browser] = {}
+    _users: Dict[Tuple, int] = {}
+    _idle_tasks: Dict[Tuple, asyncio.Task] = {}
+    
+    @staticmethod
+    def key(browser_type: BrowserType, launch_args: Dict) -> Tuple:
+        """Pool key for a set of launch options"""
+        proxy = launch_args.get("proxy")
+        return (
+            browser_type.value,
+            launch_args.get("headless", True),
+            tuple(launch_args.get("args", ())),
+            tuple(sorted(proxy.items())) if proxy else None,
+        )
+    
+    @classmethod
+    async def acquire(cls, browser_type: BrowserType, launch_args: Dict) -> Browser:
+        """Return a live pooled browser for these options, launching one if needed"""
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        
+        key = cls.key(browser_type, launch_args)
+        async with cls._lock:
+            idle_task = cls._idle_tasks.pop(key, None)
+            if idle_task:
+                idle_task.cancel()
+            
+            browser = cls._browsers.get(key)
+            if browser is None or not browser.is_connected():
+                if cls._playwright is None:
+                    cls._playwright = await async_playwright().start()
+                browser = await getattr(cls._playwright, browser_type.value).launch(**launch_args)
+                cls._browsers[key] = browser
+                logger.info(f"✓ Launched pooled browser: {browser_type.value}")
+            else:
+                logger.info(f"✓ Reusing pooled browser: {browser_type.value}")
+            
+            cls._users[key] = cls._users.get(key, 0) + 1
+            return browser
+    
+    @classmethod
+    def release(cls, key: Tuple):
+        """Return a browser to the pool, closing it after IDLE_TTL_S unused"""
+        users = cls._users.get(key, 0) - 1
+        cls._users[key] = max(0, users)
+        if users <= 0 and key in cls._browsers:
+            cls._idle_tasks[key] = asyncio.create_task(cls._close_when_idle(key))
+    
+    @classmethod
+    async def _close_when_idle(cls, key: Tuple):
+        await asyncio.sleep(cls.IDLE_TTL_S)
+        async with cls._lock:
+            cls._idle_tasks.pop(key, None)
+            browser = cls._browsers.pop(key, None)
+        if browser:
+            await browser.close()
+    
+    @classmethod
+    async def shutdown(cls):
+        """Close all pooled browsers and stop Playwright"""
+        for task in cls._idle_tasks.values():
+            task.cancel()
+        cls._idle_tasks.clear()
+        
+        for browser in cls._browsers.values():
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.error(f"Error closing pooled browser: {str(e)}")
+        cls._browsers.clear()
+        cls._users.clear()
+        
+        if cls._playwright:
+            await cls._playwright.stop()
+            cls._playwright = None
 
 
 # ============================================================================
@@ -213,20 +442,117 @@ class LocatorStrategy:
 class BrowserController:
     """Controls Playwright browser automation with intelligent error handling"""
     
-    def __init__(self, browser_type: BrowserType = BrowserType.CHROMIUM):
+    # Actions that can run as plain DOM operations inside one page.evaluate.
+    # A click may start a navigation, so it always ends a batch.
+    _JS_BATCHABLE = frozenset({
+        ActionType.CLICK,
+        ActionType.FILL,
+        ActionType.SCROLL,
+        ActionType.EXTRACT_TEXT,
+        ActionType.GET_HTML,
+    })
+    
+    # Runs steps in order and stops at the first element that is missing or
+    # not visible, so the caller can resume from there with native Playwright
+    _JS_BATCH_SCRIPT = """
+        (steps) => {
+            const results = [];
+            for (const step of steps) {
+                const started = performance.now();
+                let output = null;
+                if (step.op === "scroll") {
+                    if (step.value === null) {
+                        window.scrollTo(0, document.body.scrollHeight);
+                    } else {
+                        window.scrollBy(0, step.value);
+                    }
+                } else {
+                    // AUTO selectors without a prefix may be text rather than
+                    // CSS; leave those to the native path like a missing element
+                    let el;
+                    try {
+                        el = document.querySelector(step.selector);
+                    } catch (e) {
+                        if (e instanceof DOMException && e.name === "SyntaxError") {
+                            break;
+                        }
+                        throw e;
+                    }
+                    if (!el || !el.getClientRects().length || getComputedStyle(el).visibility === "hidden") {
+                        break;
+                    }
+                    if (step.op === "click") {
+                        el.click();
+                    } else if (step.op === "fill") {
+                        const proto = Object.getPrototypeOf(el);
+                        const setter = Object.getOwnPropertyDescriptor(proto, "value")?.set;
+                        if (!setter) {
+                            break;
+                        }
+                        el.focus();
+                        setter.call(el, step.value);
+                        el.dispatchEvent(new Event("input", { bubbles: true }));
+                        el.dispatchEvent(new Event("change", { bubbles: true }));
+                    } else if (step.op === "extract_text") {
+                        output = el.textContent;
+                    } else if (step.op === "get_html") {
+                        output = el.innerHTML;
+                    }
+                }
+                results.push({ output, ms: performance.now() - started });
+            }
+            return results;
+        }
+    """
+    
+    # Action type -> handler method name, each called as handler(action, result)
+    _DISPATCH = {
+        ActionType.NAVIGATE: "_navigate",
+        ActionType.CLICK: "_click",
+        ActionType.TYPE: "_type",
+        ActionType.FILL: "_fill",
+        ActionType.SELECT: "_select",
+        ActionType.CHECK: "_check",
+        ActionType.UNCHECK: "_uncheck",
+        ActionType.SCREENSHOT: "_screenshot",
+        ActionType.EXTRACT_TEXT: "_extract_text",
+        ActionType.EXTRACT_ATTRIBUTES: "_extract_attributes",
+        ActionType.WAIT: "_wait",
+        ActionType.SCROLL: "_scroll",
+        ActionType.HOVER: "_hover",
+        ActionType.FOCUS: "_focus",
+        ActionType.PRESS_KEY: "_press_key",
+        ActionType.GET_HTML: "_get_html",
+        ActionType.EVALUATE: "_evaluate",
+        ActionType.WAIT_FOR_ELEMENT: "_wait_for_element",
+        ActionType.GET_TITLE: "_get_title",
+        ActionType.GET_URL: "_get_url",
+        ActionType.GO_BACK: "_go_back",
+        ActionType.GO_FORWARD: "_go_forward",
+        ActionType.RELOAD: "_reload",
+    }
+    
+    # Screenshot key numbers, shared so parallel controllers never collide
+    _screenshot_ids = itertools.count(1)
+    
+    def __init__(self, browser_type: BrowserType = BrowserType.CHROMIUM, inline_screenshots: bool = False):
         self.browser_type = browser_type
+        self.inline_screenshots = inline_screenshots
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self.playwright = None
+        self._pool_key: Optional[Tuple] = None
         self.action_count = 0
         self.start_time = None
+        self._inflight_requests = 0
+        self._locator_cache: Dict[Tuple[str, str], Tuple[Locator, float]] = {}
+        self._last_screenshot_hash: Optional[bytes] = None
+        self._last_screenshot_result: Optional[ActionResult] = None
         
-    async def launch(self, headless: bool = True, proxy: Optional[Dict] = None, stealth_mode: bool = False):
+    async def launch(self, headless: bool = True, proxy: Optional[Dict] = None, stealth_mode: bool = False,
+                     block_urls: Optional[List[str]] = None):
         """Launch browser instance with proxy and anti-detection support"""
         try:
-            self.playwright = await async_playwright().start()
-            
             # Configure launch arguments
             launch_args = {
                 "headless": headless,
@@ -265,13 +591,9 @@ class BrowserController:
             if proxy_config:
                 launch_args["proxy"] = proxy_config
             
-            # Launch browser
-            if self.browser_type == BrowserType.CHROMIUM:
-                self.browser = await self.playwright.chromium.launch(**launch_args)
-            elif self.browser_type == BrowserType.FIREFOX:
-                self.browser = await self.playwright.firefox.launch(**launch_args)
-            elif self.browser_type == BrowserType.WEBKIT:
-                self.browser = await self.playwright.webkit.launch(**launch_args)
+            # Launch browser, or reuse a pooled one with the same options
+            self.browser = await BrowserPool.acquire(self.browser_type, launch_args)
+            self._pool_key = BrowserPool.key(self.browser_type, launch_args)
             
             # Create context with anti-detection
             context_options = {
@@ -291,6 +613,9 @@ class BrowserController:
                 await self._apply_stealth_mode()
             
             self.page = await self.context.new_page()
+            self._track_requests(self.page)
+            self.page.on("framenavigated", self._on_frame_navigated)
+            await self._block_urls(DEFAULT_BLOCKLIST if block_urls is None else block_urls)
             
             logger.info(f"✓ Browser launched: {self.browser_type.value} (stealth: {stealth_mode})")
             self.start_time = datetime.now()
@@ -299,123 +624,91 @@ class BrowserController:
             logger.error(f"✗ Failed to launch browser: {str(e)}")
             raise
     
+    async def _block_urls(self, patterns: List[str]):
+        """Block URL patterns at the network layer, leaving the HTTP cache usable"""
+        if not patterns:
+            return
+        if self.browser_type != BrowserType.CHROMIUM:
+            logger.info(f"URL blocking needs CDP, skipped on {self.browser_type.value}")
+            return
+        
+        # Unlike page.route, this does not force requests past the cache
+        client = await self.context.new_cdp_session(self.page)
+        await client.send("Network.enable")
+        await client.send("Network.setBlockedURLs", {"urls": list(patterns)})
+        logger.info(f"✓ Blocking {len(patterns)} URL patterns")
+    
+    def _track_requests(self, page: Page):
+        """Keep a count of in-flight requests for _settle"""
+        def started(_):
+            self._inflight_requests += 1
+        
+        def finished(_):
+            self._inflight_requests = max(0, self._inflight_requests - 1)
+        
+        page.on("request", started)
+        page.on("requestfinished", finished)
+        page.on("requestfailed", finished)
+    
+    def _on_frame_navigated(self, frame):
+        """Drop cached locators once the main frame shows a new document"""
+        if frame.parent_frame is None:
+            self._locator_cache.clear()
+    
+    async def _resolve(self, action: Action, refresh: bool = False) -> Optional[Locator]:
+        """Find the action's element, reusing a recent lookup of the same selector.
+        
+        With refresh set, always waits on the page and only updates the cache.
+        """
+        key = (action.selector, action.selector_type.value)
+        now = asyncio.get_running_loop().time()
+        
+        cached = self._locator_cache.get(key)
+        if not refresh and cached and cached[1] > now:
+            return cached[0]
+        
+        locator = await LocatorStrategy.find_element(
+            self.page, action.selector, action.selector_type, action.timeout
+        )
+        if locator is not None:
+            self._locator_cache[key] = (locator, now + LOCATOR_CACHE_TTL_S)
+        return locator
+    
+    async def _settle(self, max_ms: int = DEFAULT_SETTLE_MS, quiet_ms: int = 300):
+        """Wait until no requests have been in flight for quiet_ms, or max_ms elapses"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_ms / 1000
+        quiet_since = None
+        
+        while loop.time() < deadline:
+            if self._inflight_requests == 0:
+                now = loop.time()
+                if quiet_since is None:
+                    quiet_since = now
+                elif now - quiet_since >= quiet_ms / 1000:
+                    return
+            else:
+                quiet_since = None
+            await asyncio.sleep(0.05)
+    
     async def _apply_stealth_mode(self):
         """Apply anti-detection measures"""
-        await self.context.add_init_script("""
-            // Remove webdriver property
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            
-            // Mock plugins
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-            
-            // Mock languages
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en']
-            });
-            
-            // Add chrome object
-            window.chrome = {
-                runtime: {}
-            };
-            
-            // Mock permissions
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                Promise.resolve({ state: Notification.permission }) :
-                originalQuery(parameters)
-            );
-        """)
+        await self.context.add_init_script(_STEALTH_JS)
         logger.info("✓ Stealth mode enabled")
     
     async def execute_action(self, action: Action) -> ActionResult:
         """Execute a single automation action"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         result = ActionResult(
             success=False,
             action=action,
-            timestamp=datetime.now().isoformat()
+            timestamp_ns=time.time_ns()
         )
         
         try:
-            if action.type == ActionType.NAVIGATE:
-                await self._navigate(action, result)
-            
-            elif action.type == ActionType.CLICK:
-                await self._click(action, result)
-            
-            elif action.type == ActionType.TYPE:
-                await self._type(action, result)
-            
-            elif action.type == ActionType.FILL:
-                await self._fill(action, result)
-            
-            elif action.type == ActionType.SELECT:
-                await self._select(action, result)
-            
-            elif action.type == ActionType.CHECK:
-                await self._check(action, result)
-            
-            elif action.type == ActionType.UNCHECK:
-                await self._uncheck(action, result)
-            
-            elif action.type == ActionType.SCREENSHOT:
-                await self._screenshot(action, result)
-            
-            elif action.type == ActionType.EXTRACT_TEXT:
-                await self._extract_text(action, result)
-            
-            elif action.type == ActionType.EXTRACT_ATTRIBUTES:
-                await self._extract_attributes(action, result)
-            
-            elif action.type == ActionType.WAIT:
-                await self._wait(action, result)
-            
-            elif action.type == ActionType.SCROLL:
-                await self._scroll(action, result)
-            
-            elif action.type == ActionType.HOVER:
-                await self._hover(action, result)
-            
-            elif action.type == ActionType.FOCUS:
-                await self._focus(action, result)
-            
-            elif action.type == ActionType.PRESS_KEY:
-                await self._press_key(action, result)
-            
-            elif action.type == ActionType.GET_HTML:
-                await self._get_html(action, result)
-            
-            elif action.type == ActionType.EVALUATE:
-                await self._evaluate(action, result)
-            
-            elif action.type == ActionType.WAIT_FOR_ELEMENT:
-                await self._wait_for_element(action, result)
-            
-            elif action.type == ActionType.GET_TITLE:
-                result.output = await self.page.title()
-                result.success = True
-            
-            elif action.type == ActionType.GET_URL:
-                result.output = self.page.url
-                result.success = True
-            
-            elif action.type == ActionType.GO_BACK:
-                await self.page.go_back()
-                result.success = True
-            
-            elif action.type == ActionType.GO_FORWARD:
-                await self.page.go_forward()
-                result.success = True
-            
-            elif action.type == ActionType.RELOAD:
-                await self.page.reload()
-                result.success = True
-            
+            handler = getattr(self, self._DISPATCH.get(action.type, ""), None)
+            if handler:
+                await handler(action, result)
             else:
                 result.error = f"Unknown action type: {action.type}"
             
@@ -423,11 +716,109 @@ class BrowserController:
             
         except Exception as e:
             result.error = str(e)
-            logger.error(f"✗ Action failed: {action.type.value} - {str(e)}")
+            logger.error("✗ Action failed: %s - %s", action.type.value, e)
         
-        result.execution_time_ms = (time.time() - start_time) * 1000
+        result.execution_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
         return result
     
+    async def execute_actions_batch(self, actions: List[Action], use_js_batching: bool = False,
+                                    on_result: Optional[Callable[[ActionResult], None]] = None) -> List[ActionResult]:
+        """Execute actions in order, optionally coalescing runs of simple DOM actions.
+        
+        on_result, if given, is called with each result as soon as it is available.
+        """
+        results: List[ActionResult] = []
+        i = 0
+        
+        while i < len(actions):
+            if use_js_batching:
+                end = i
+                while end < len(actions) and self._js_step(actions[end]) is not None:
+                    end += 1
+                    if actions[end - 1].type == ActionType.CLICK:
+                        break
+                
+                if end - i > 1:
+                    batch_results = await self._execute_js_batch(actions[i:end])
+                    if batch_results:
+                        results.extend(batch_results)
+                        if on_result:
+                            for result in batch_results:
+                                on_result(result)
+                        i += len(batch_results)
+                        continue
+            
+            logger.debug("[%d/%d] Executing: %s", i + 1, len(actions), actions[i].type.value)
+            result = await self.execute_action(actions[i])
+            results.append(result)
+            if on_result:
+                on_result(result)
+            i += 1
+        
+        return results
+    
+    def _js_step(self, action: Action) -> Optional[Dict]:
+        """Translate an action into a JS batch step, or None if it needs native Playwright"""
+        if action.type not in self._JS_BATCHABLE:
+            return None
+        
+        if action.type == ActionType.SCROLL:
+            if action.value is None:
+                return {"op": "scroll", "value": None}
+            try:
+                return {"op": "scroll", "value": int(action.value)}
+            except (TypeError, ValueError):
+                return None
+        
+        # querySelector only understands CSS
+        if not action.selector:
+            return None
+        if action.selector_type == SelectorType.CSS:
+            selector = action.selector
+        elif action.selector_type == SelectorType.AUTO:
+            strategy, selector = LocatorStrategy._classify(action.selector)
+            if strategy != "css":
+                return None
+        else:
+            return None
+        
+        if action.type == ActionType.FILL:
+            if action.value is None:
+                return None
+            return {"op": "fill", "selector": selector, "value": str(action.value)}
+        
+        return {"op": action.type.value, "selector": selector, "value": None}
+    
+    async def _execute_js_batch(self, actions: List[Action]) -> List[ActionResult]:
+        """Run a batch of simple actions in a single evaluate round-trip"""
+        timestamp_ns = time.time_ns()
+        steps = [self._js_step(action) for action in actions]
+        
+        try:
+            step_results = await self.page.evaluate(self._JS_BATCH_SCRIPT, steps)
+        except PlaywrightError as e:
+            # Steps may have partially run, so don't replay them natively
+            logger.error("✗ Action batch failed: %s", e)
+            self.action_count += len(actions)
+            return [
+                ActionResult(success=False, action=action, error=str(e), timestamp_ns=timestamp_ns)
+                for action in actions
+            ]
+        
+        results = []
+        for action, step_result in zip(actions, step_results):
+            results.append(ActionResult(
+                success=True,
+                action=action,
+                output=step_result["output"],
+                execution_time_ms=step_result["ms"],
+                timestamp_ns=timestamp_ns
+            ))
+        
+        self.action_count += len(results)
+        logger.debug("✓ Executed %d/%d actions in one batch", len(results), len(actions))
+        return results
+    
     # ========== ACTION IMPLEMENTATIONS ==========
     
     async def _navigate(self, action: Action, result: ActionResult):
@@ -435,7 +826,15 @@ class BrowserController:
         if not action.value:
             raise ValueError("Navigate action requires 'value' (URL)")
         
-        await self.page.goto(str(action.value), wait_until="networkidle")
+        self._last_screenshot_hash = None
+        await self.page.goto(str(action.value), wait_until="domcontentloaded", timeout=action.timeout)
+        settle_ms = (action.metadata or {}).get("settle_ms", DEFAULT_SETTLE_MS)
+        try:
+            settle_ms = max(0, int(settle_ms))
+        except (TypeError, ValueError):
+            logger.warning("Invalid settle_ms %r, using %d", settle_ms, DEFAULT_SETTLE_MS)
+            settle_ms = DEFAULT_SETTLE_MS
+        await self._settle(settle_ms)
         result.success = True
         result.output = self.page.url
     
@@ -444,9 +843,7 @@ class BrowserController:
         if not action.selector:
             raise ValueError("Click action requires 'selector'")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
@@ -460,13 +857,17 @@ class BrowserController:
         if action.value is None:
             raise ValueError("Type action requires 'value' (text to type)")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
-        await locator.first.type(str(action.value), delay=50)
+        if (action.metadata or {}).get("human_typing"):
+            # Per-keystroke events for pages that validate on every key
+            await locator.first.type(str(action.value), delay=50)
+        else:
+            # One input event at the caret, which keeps the append semantics
+            await locator.first.focus()
+            await self.page.keyboard.insert_text(str(action.value))
         result.success = True
     
     async def _fill(self, action: Action, result: ActionResult):
@@ -476,9 +877,7 @@ class BrowserController:
         if action.value is None:
             raise ValueError("Fill action requires 'value'")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
@@ -492,9 +891,7 @@ class BrowserController:
         if action.value is None:
             raise ValueError("Select action requires 'value' (option value)")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
@@ -506,9 +903,7 @@ class BrowserController:
         if not action.selector:
             raise ValueError("Check action requires 'selector'")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
@@ -520,9 +915,7 @@ class BrowserController:
         if not action.selector:
             raise ValueError("Uncheck action requires 'selector'")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
@@ -531,9 +924,37 @@ class BrowserController:
     
     async def _screenshot(self, action: Action, result: ActionResult):
         """Take screenshot of page or element"""
+        metadata = action.metadata or {}
+        image_format = metadata.get("format", "png")
+        if image_format not in ("png", "jpeg"):
+            raise ValueError(f"Unsupported screenshot format: {image_format}")
+        
+        options = {"type": image_format, "full_page": metadata.get("full_page", True)}
+        if image_format == "jpeg":
+            options["quality"] = int(metadata.get("quality", 80))
+        
         try:
-            screenshot_bytes = await self.page.screenshot(full_page=True)
-            result.screenshot_base64 = base64.b64encode(screenshot_bytes).decode('utf-8')
+            screenshot_bytes = await self.page.screenshot(**options)
+            
+            # Point identical captures at the previous screenshot instead of storing it again
+            screenshot_hash = hashlib.sha256(screenshot_bytes).digest()
+            if screenshot_hash == self._last_screenshot_hash:
+                previous = self._last_screenshot_result
+                result.screenshot_key = previous.screenshot_key
+                result.screenshot_base64 = previous.screenshot_base64
+                result.success = True
+                result.output = "unchanged"
+                return
+            
+            if self.inline_screenshots:
+                result.screenshot_base64 = base64.b64encode(screenshot_bytes).decode('utf-8')
+            else:
+                # Store the image as-is and keep only its key in the dataset item
+                key = f"SCREENSHOT_{next(self._screenshot_ids)}"
+                await Actor.set_value(key, screenshot_bytes, content_type=f"image/{image_format}")
+                result.screenshot_key = key
+            self._last_screenshot_hash = screenshot_hash
+            self._last_screenshot_result = result
             result.success = True
             result.output = f"Screenshot captured ({len(screenshot_bytes)} bytes)"
         except Exception as e:
@@ -543,13 +964,11 @@ class BrowserController:
         """Extract text from element"""
         if not action.selector:
             # Get all text from page
-            result.output = await self.page.content()
+            result.output = await self._page_html(action)
             result.success = True
             return
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
@@ -561,22 +980,22 @@ class BrowserController:
         if not action.selector:
             raise ValueError("Extract attributes requires 'selector'")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
-        element = locator.first
-        result.output = {
-            "text": await element.text_content(),
-            "class": await element.get_attribute("class"),
-            "id": await element.get_attribute("id"),
-            "href": await element.get_attribute("href"),
-            "src": await element.get_attribute("src"),
-            "value": await element.get_attribute("value"),
-            "placeholder": await element.get_attribute("placeholder"),
-        }
+        # One round-trip instead of one per attribute
+        result.output = await locator.first.evaluate("""
+            (el) => ({
+                text: el.textContent,
+                class: el.getAttribute("class"),
+                id: el.getAttribute("id"),
+                href: el.getAttribute("href"),
+                src: el.getAttribute("src"),
+                value: el.getAttribute("value"),
+                placeholder: el.getAttribute("placeholder"),
+            })
+        """)
         result.success = True
     
     async def _wait(self, action: Action, result: ActionResult):
@@ -604,9 +1023,7 @@ class BrowserController:
         if not action.selector:
             raise ValueError("Hover action requires 'selector'")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
@@ -618,9 +1035,7 @@ class BrowserController:
         if not action.selector:
             raise ValueError("Focus action requires 'selector'")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
@@ -634,9 +1049,7 @@ class BrowserController:
         if not action.value:
             raise ValueError("Press key action requires 'value' (key name)")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        locator = await self._resolve(action)
         if not locator:
             raise ValueError(f"Element not found: {action.selector}")
         
@@ -647,11 +1060,9 @@ class BrowserController:
         """Get HTML of element or page"""
         if not action.selector:
             # Get full page HTML
-            result.output = await self.page.content()
+            result.output = await self._page_html(action)
         else:
-            locator = await LocatorStrategy.find_element(
-                self.page, action.selector, action.selector_type, action.timeout
-            )
+            locator = await self._resolve(action)
             if not locator:
                 raise ValueError(f"Element not found: {action.selector}")
             
@@ -659,6 +1070,17 @@ class BrowserController:
         
         result.success = True
     
+    async def _page_html(self, action: Action) -> str:
+        """Page HTML, re-fetched over HTTP instead of serializing the DOM when raw_fetch is set"""
+        if (action.metadata or {}).get("raw_fetch"):
+            # Shares the context's cookies and proxy, but returns the server's
+            # HTML rather than the current (script-modified) DOM
+            response = await self.page.context.request.get(self.page.url, timeout=action.timeout)
+            if response.ok:
+                return await response.text()
+            logger.warning(f"Raw fetch returned HTTP {response.status}, using page content")
+        return await self.page.content()
+    
     async def _evaluate(self, action: Action, result: ActionResult):
         """Execute JavaScript"""
         if not action.value:
@@ -672,23 +1094,49 @@ class BrowserController:
         if not action.selector:
             raise ValueError("Wait for element requires 'selector'")
         
-        locator = await LocatorStrategy.find_element(
-            self.page, action.selector, action.selector_type, action.timeout
-        )
+        # An explicit wait must check the page now, not trust a recent lookup
+        locator = await self._resolve(action, refresh=True)
         if not locator:
             raise ValueError(f"Element not found or timeout: {action.selector}")
         
         result.success = True
     
+    async def _get_title(self, action: Action, result: ActionResult):
+        """Get page title"""
+        result.output = await self.page.title()
+        result.success = True
+    
+    async def _get_url(self, action: Action, result: ActionResult):
+        """Get current page URL"""
+        result.output = self.page.url
+        result.success = True
+    
+    async def _go_back(self, action: Action, result: ActionResult):
+        """Navigate back in history"""
+        self._last_screenshot_hash = None
+        await self.page.go_back()
+        result.success = True
+    
+    async def _go_forward(self, action: Action, result: ActionResult):
+        """Navigate forward in history"""
+        self._last_screenshot_hash = None
+        await self.page.go_forward()
+        result.success = True
+    
+    async def _reload(self, action: Action, result: ActionResult):
+        """Reload the current page"""
+        self._last_screenshot_hash = None
+        await self.page.reload()
+        result.success = True
+    
     async def close(self):
-        """Close browser and cleanup"""
+        """Close the browser context and return the browser to the pool"""
         try:
             if self.context:
                 await self.context.close()
-            if self.browser:
-                await self.browser.close()
-            if self.playwright:
-                await self.playwright.stop()
+            if self._pool_key:
+                BrowserPool.release(self._pool_key)
+                self._pool_key = None
             logger.info("✓ Browser closed successfully")
         except Exception as e:
             logger.error(f"Error closing browser: {str(e)}")
@@ -702,8 +1150,9 @@ class PlaywrightMCPActor:
     """Main Apify Actor for Playwright MCP integration"""
     
     def __init__(self):
-        self.controller: Optional[BrowserController] = None
         self.results: List[ActionResult] = []
+        self._push_queue: Optional[asyncio.Queue] = None
+        self._push_task: Optional[asyncio.Task] = None
         self.stats = {
             "total_actions": 0,
             "successful_actions": 0,
@@ -717,7 +1166,10 @@ class PlaywrightMCPActor:
         actor_input = await Actor.get_input()
         
         # Handle missing or empty input (for Apify automated daily testing)
-        if actor_input is None or not actor_input or (isinstance(actor_input, dict) and not actor_input.get("actions")):
+        if actor_input is None or not actor_input or (
+            isinstance(actor_input, dict)
+            and not any(actor_input.get(k) for k in ("actions", "parallel_groups", "template"))
+        ):
             logger.info("🤖 No input provided - using default test actions for automated testing")
             # Provide a comprehensive default demo input for Apify's daily automated runs
             actor_input = {
@@ -747,7 +1199,11 @@ class PlaywrightMCPActor:
             }
             logger.info("✓ Loaded 4 default test actions (navigate, get_title, extract_text, screenshot)")
         
-        logger.info(f"Received input: {json.dumps(actor_input, indent=2)}")
+        logger.debug("Received input: %s", actor_input)
+        
+        # Results are pushed in the background while the browser keeps working
+        self._push_queue = asyncio.Queue()
+        self._push_task = asyncio.create_task(self._push_worker())
         
         try:
             # Check if using template
@@ -758,56 +1214,69 @@ class PlaywrightMCPActor:
                 
                 # Generate actions from template
                 try:
-                    actions_data = TemplateManager.get_template(template_name, template_params)
+                    actions_data = list(TemplateManager.get_template(template_name, template_params))
                     logger.info(f"✓ Generated {len(actions_data)} actions from template")
                 except Exception as e:
                     raise ValueError(f"Template error: {str(e)}")
+                groups_data = [actions_data]
+            elif actor_input.get("parallel_groups"):
+                # Independent action sequences, each run in its own context
+                groups_data = actor_input["parallel_groups"]
+                if not isinstance(groups_data, list):
+                    raise ValueError("'parallel_groups' must be an array of action arrays")
             else:
                 # Use regular actions
-                actions_data = actor_input.get("actions", [])
+                groups_data = [actor_input.get("actions", [])]
             
-            # Validate input
-            self._validate_input({"actions": actions_data})
+            # Validate and parse every action up front so bad input fails
+            # before any browser is launched
+            groups = []
+            for group_data in groups_data:
+                self._validate_input({"actions": group_data})
+                groups.append(self._parse_actions(group_data))
             
             # Initialize browser
             browser_type = BrowserType(actor_input.get("browser_type", "chromium"))
-            headless = actor_input.get("headless", True)
-            proxy = actor_input.get("proxy")
-            stealth_mode = actor_input.get("stealth_mode", False)
+            launch_options = {
+                "headless": actor_input.get("headless", True),
+                "proxy": actor_input.get("proxy"),
+                "stealth_mode": actor_input.get("stealth_mode", False),
+                "block_urls": actor_input.get("block_urls"),
+            }
+            use_js_batching = actor_input.get("batch_actions", False)
+            controller_options = {
+                "inline_screenshots": actor_input.get("inline_screenshots", False),
+            }
             
-            self.controller = BrowserController(browser_type)
-            await self.controller.launch(headless=headless, proxy=proxy, stealth_mode=stealth_mode)
-            logger.info(f"✓ Browser initialized: {browser_type.value}")
-            logger.info(f"📋 Executing {len(actions_data)} actions...")
+            logger.info(f"📋 Executing {sum(len(g) for g in groups)} actions in {len(groups)} sequence(s)...")
             
-            for i, action_data in enumerate(actions_data, 1):
-                logger.info(f"[{i}/{len(actions_data)}] Executing: {action_data.get('type')}")
-                
-                action = self._parse_action(action_data)
-                result = await self.controller.execute_action(action)
-                self.results.append(result)
-                
-                # Update stats
-                self.stats["total_actions"] += 1
-                if result.success:
-                    self.stats["successful_actions"] += 1
-                    logger.info(f"✓ Success ({result.execution_time_ms:.0f}ms)")
-                else:
-                    self.stats["failed_actions"] += 1
-                    logger.warning(f"✗ Failed: {result.error}")
-                
-                if result.screenshot_base64:
-                    self.stats["screenshots_captured"] += 1
-                
-                self.stats["total_execution_time_ms"] += result.execution_time_ms
-                
-                # Push progress to Apify
-                await Actor.push_data({"type": "action_result", "data": result.to_dict()})
+            # Resolve navigate hosts while the browser starts. A proxy does its
+            # own DNS, so there is nothing to warm then
+            prewarm_task = None
+            if not launch_options["proxy"]:
+                prewarm_task = asyncio.create_task(self._prewarm_dns(groups))
+            
+            # Groups share one pooled browser. Progress items are pushed as
+            # actions finish; the final output keeps group order
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_GROUPS)
+            group_results = await asyncio.gather(*(
+                self._run_group(group, browser_type, controller_options, launch_options,
+                                use_js_batching, semaphore, self._record_result)
+                for group in groups
+            ), return_exceptions=True)
+            if prewarm_task:
+                prewarm_task.cancel()
+            for group_result in group_results:
+                if isinstance(group_result, BaseException):
+                    raise group_result
+            self.results = [result for group in group_results for result in group]
+            
+            await self._push_queue.join()
             
             # Prepare final output
             output = self._prepare_output()
             logger.info(f"✓ Completed successfully!")
-            logger.info(f"Stats: {json.dumps(self.stats, indent=2)}")
+            logger.info("Stats: %s", to_json_bytes(self.stats).decode())
             
             # Export data if requested
             export_format = actor_input.get("export_format", "json")
@@ -819,6 +1288,7 @@ class PlaywrightMCPActor:
             
         except Exception as e:
             logger.error(f"✗ Actor failed: {str(e)}")
+            await self._push_queue.join()
             await Actor.push_data({
                 "success": False,
                 "error": str(e),
@@ -827,8 +1297,85 @@ class PlaywrightMCPActor:
             raise
         
         finally:
-            if self.controller:
-                await self.controller.close()
+            self._push_task.cancel()
+    
+    async def _run_group(self, actions: List[Action], browser_type: BrowserType,
+                         controller_options: Dict, launch_options: Dict,
+                         use_js_batching: bool, semaphore: asyncio.Semaphore,
+                         on_result: Optional[Callable[[ActionResult], None]] = None) -> List[ActionResult]:
+        """Run one action sequence on its own browser context"""
+        async with semaphore:
+            controller = BrowserController(browser_type, **controller_options)
+            try:
+                await controller.launch(**launch_options)
+                logger.info(f"✓ Browser initialized: {browser_type.value}")
+                
+                return await controller.execute_actions_batch(
+                    actions, use_js_batching=use_js_batching, on_result=on_result
+                )
+            finally:
+                await controller.close()
+    
+    @staticmethod
+    async def _prewarm_dns(groups: List[List[Action]]):
+        """Best-effort DNS lookups for every navigate target so the OS resolver cache is warm"""
+        hosts = set()
+        for group in groups:
+            for action in group:
+                if action.type == ActionType.NAVIGATE and action.value:
+                    # Malformed URLs and ports (":abc", ":99999") raise ValueError;
+                    # the navigate itself reports those
+                    try:
+                        parts = urlsplit(str(action.value))
+                        if parts.hostname:
+                            hosts.add((parts.hostname, parts.port or (80 if parts.scheme == "http" else 443)))
+                    except ValueError:
+                        continue
+        if not hosts:
+            return
+        
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(loop.getaddrinfo(host, port) for host, port in hosts), return_exceptions=True),
+                DNS_PREWARM_TIMEOUT_S,
+            )
+        except asyncio.TimeoutError:
+            pass
+        logger.debug("Pre-resolved %d navigate hosts", len(hosts))
+    
+    def _record_result(self, result: ActionResult):
+        """Update stats for a finished action and queue its dataset item"""
+        self.stats["total_actions"] += 1
+        if result.success:
+            self.stats["successful_actions"] += 1
+            logger.debug("✓ Success (%.0fms)", result.execution_time_ms)
+        else:
+            self.stats["failed_actions"] += 1
+            logger.warning("✗ Failed: %s", result.error)
+        
+        # Deduplicated captures point at an earlier image and store nothing new
+        if (result.screenshot_key or result.screenshot_base64) and result.output != "unchanged":
+            self.stats["screenshots_captured"] += 1
+        
+        self.stats["total_execution_time_ms"] += result.execution_time_ms
+        
+        self._push_queue.put_nowait({"type": "action_result", "data": result.to_dict()})
+    
+    async def _push_worker(self):
+        """Push queued dataset items, sending everything waiting in one call"""
+        queue = self._push_queue
+        while True:
+            items = [await queue.get()]
+            while len(items) < PUSH_BATCH_SIZE and not queue.empty():
+                items.append(queue.get_nowait())
+            try:
+                await Actor.push_data(items)
+            except Exception as e:
+                logger.error(f"Failed to push {len(items)} results: {str(e)}")
+            finally:
+                for _ in items:
+                    queue.task_done()
     
     @staticmethod
     def _validate_input(actor_input: Dict) -> None:
@@ -845,11 +1392,24 @@ class PlaywrightMCPActor:
         if len(actor_input["actions"]) == 0:
             raise ValueError("'actions' array cannot be empty")
     
+    @staticmethod
+    def _parse_actions(actions_data: List[Dict]) -> List[Action]:
+        """Parse a whole action sequence, naming the first invalid action"""
+        actions = []
+        for i, action_data in enumerate(actions_data, 1):
+            if not isinstance(action_data, Mapping):
+                raise ValueError(f"Action {i} must be an object")
+            try:
+                actions.append(PlaywrightMCPActor._parse_action(action_data))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid action {i} ({action_data.get('type')}): {str(e)}")
+        return actions
+    
     @staticmethod
     def _parse_action(action_data: Dict) -> Action:
         """Parse action from input"""
-        action_type = ActionType(action_data.get("type"))
-        selector_type = SelectorType(action_data.get("selector_type", "auto"))
+        action_type = _action_type(action_data.get("type"))
+        selector_type = _selector_type(action_data.get("selector_type", "auto"))
         
         return Action(
             type=action_type,
@@ -876,35 +1436,57 @@ class PlaywrightMCPActor:
             "timestamp": datetime.now().isoformat()
         }
     
+    # Columns of the flat export rows, in file order
+    _EXPORT_FIELDS = ("type", "selector", "success", "execution_time_ms", "timestamp", "error", "output")
+    
+    @staticmethod
+    def _flat_row(action: Dict) -> Dict:
+        """Flatten an action result for export (no nested objects)"""
+        output = action.get("output")
+        if output is None:
+            output = ""
+        elif not isinstance(output, str):
+            # Structured outputs (evaluate results, attributes) as JSON
+            output = to_json_bytes(output).decode()
+        return {
+            "type": action.get("type"),
+            "selector": action.get("selector"),
+            "success": action.get("success"),
+            "execution_time_ms": action.get("execution_time_ms"),
+            "timestamp": action.get("timestamp"),
+            "error": action.get("error"),
+            "output": output[:500]  # Truncate output
+        }
+    
     async def _export_data(self, data: Dict, export_format: str):
-        """Export data in requested format (CSV or Excel)"""
+        """Export data in requested format (CSV, Excel, Parquet or Feather)"""
         try:
             exporter = DataExporter()
             
-            # Extract flat data for export (actions only, no nested objects)
-            export_data = []
-            for action in data.get("actions", []):
-                flat_action = {
-                    "type": action.get("type"),
-                    "selector": action.get("selector"),
-                    "success": action.get("success"),
-                    "execution_time_ms": action.get("execution_time_ms"),
-                    "timestamp": action.get("timestamp"),
-                    "error": action.get("error"),
-                    "output": str(action.get("output", ""))[:500]  # Truncate output
-                }
-                export_data.append(flat_action)
+            # Flat rows are built lazily; CSV and Excel consume them one at a time
+            rows = (self._flat_row(action) for action in data.get("actions", []))
             
             if export_format == "csv":
-                csv_content = exporter.export_to_csv(export_data)
+                csv_content = b"".join(exporter.iter_csv_chunks(rows, fieldnames=self._EXPORT_FIELDS))
                 await Actor.set_value("OUTPUT_CSV", csv_content, content_type="text/csv")
                 logger.info(f"✓ Exported data to CSV ({len(csv_content)} bytes)")
                 
             elif export_format == "excel":
-                excel_content = exporter.export_to_excel(export_data)
+                # Local memory storage rejects file-like values, so hand over bytes
+                excel_content = exporter.export_to_excel_bytes(rows, fieldnames=self._EXPORT_FIELDS)
                 await Actor.set_value("OUTPUT_EXCEL", excel_content, content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
                 logger.info(f"✓ Exported data to Excel ({len(excel_content)} bytes)")
                 
+            elif export_format == "parquet":
+                parquet_content = exporter.export_to_parquet(list(rows))
+                await Actor.set_value("OUTPUT_PARQUET", parquet_content, content_type="application/vnd.apache.parquet")
+                logger.info(f"✓ Exported data to Parquet ({len(parquet_content)} bytes)")
+                
+            elif export_format == "feather":
+                feather_content = exporter.export_to_feather(list(rows))
+                await Actor.set_value("OUTPUT_FEATHER", feather_content, content_type="application/vnd.apache.arrow.file")
+                logger.info(f"✓ Exported data to Feather ({len(feather_content)} bytes)")
+                
         except Exception as e:
             logger.warning(f"Export failed: {str(e)}")
             # Don't fail the entire run if export fails
@@ -918,7 +1500,10 @@ async def main():
     """Entry point"""
     async with Actor:
         actor = PlaywrightMCPActor()
-        await actor.run()
+        try:
+            await actor.run()
+        finally:
+            await BrowserPool.shutdown()
 
 
 if __name__ == "__main__":
@@ -2,85 +2,88 @@
 Template system for pre-built automation workflows
 """
 
-from typing import List, Dict, Any, Optional
+import re
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Final, Iterator, Mapping, Tuple, Union
+from urllib.parse import quote_plus
 from dataclasses import dataclass
-from enum import Enum
 
 
-class TemplateType(str, Enum):
-    """Available template types"""
-    AMAZON_PRODUCT_SEARCH = "amazon_product_search"
-    GOOGLE_SEARCH = "google_search"
-    LINKEDIN_PROFILE = "linkedin_profile"
-    TWITTER_SCRAPE = "twitter_scrape"
-    GOOGLE_MAPS_BUSINESS = "google_maps_business"
+class TemplateType:
+    """Available template types (plain interned strings)"""
+    AMAZON_PRODUCT_SEARCH: Final[str] = sys.intern("amazon_product_search")
+    GOOGLE_SEARCH: Final[str] = sys.intern("google_search")
+    LINKEDIN_PROFILE: Final[str] = sys.intern("linkedin_profile")
+    TWITTER_SCRAPE: Final[str] = sys.intern("twitter_scrape")
+    GOOGLE_MAPS_BUSINESS: Final[str] = sys.intern("google_maps_business")
 
 
-@dataclass
-class Template:
-    """Template definition"""
-    name: str
-    description: str
-    parameters: Dict[str, Any]
-    actions: List[Dict[str, Any]]
+_VALID_NAMES = frozenset((
+    TemplateType.AMAZON_PRODUCT_SEARCH,
+    TemplateType.GOOGLE_SEARCH,
+    TemplateType.LINKEDIN_PROFILE,
+    TemplateType.TWITTER_SCRAPE,
+    TemplateType.GOOGLE_MAPS_BUSINESS,
+))
 
 
-class TemplateManager:
-    """Manages pre-built templates"""
+def _build_trie(names) -> Dict[str, Any]:
+    """Character trie over template names; each node lists the names below it under '$names'"""
+    root: Dict[str, Any] = {"$names": sorted(names)}
+    for name in names:
+        node = root
+        for char in name:
+            node = node.setdefault(char, {"$names": []})
+            node["$names"].append(name)
+    return root
+
+
+# Resolves unambiguous prefixes such as "amazon" to the full template name
+_TEMPLATE_TRIE = _build_trie(_VALID_NAMES)
+
+
+def _resolve_name(prefix: str) -> str:
+    """Full template name for an exact name or unique prefix"""
+    if not isinstance(prefix, str) or not prefix:
+        raise ValueError(f"Unknown template: {prefix}")
+    if prefix in _VALID_NAMES:
+        return prefix
     
-    @staticmethod
-    def get_template(template_type: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Get actions for a specific template"""
-        
-        if template_type == "amazon_product_search":
-            return TemplateManager._amazon_product_search(params)
-        elif template_type == "google_search":
-            return TemplateManager._google_search(params)
-        elif template_type == "linkedin_profile":
-            return TemplateManager._linkedin_profile(params)
-        elif template_type == "twitter_scrape":
-            return TemplateManager._twitter_scrape(params)
-        elif template_type == "google_maps_business":
-            return TemplateManager._google_maps_business(params)
-        else:
-            raise ValueError(f"Unknown template: {template_type}")
+    node = _TEMPLATE_TRIE
+    for char in prefix:
+        node = node.get(char)
+        if node is None:
+            raise ValueError(f"Unknown template: {prefix}")
     
-    @staticmethod
-    def _amazon_product_search(params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Amazon product search template"""
-        search_query = params.get("search_query", "")
-        max_results = params.get("max_results", 20)
-        extract_reviews = params.get("extract_reviews", False)
-        
-        if not search_query:
-            raise ValueError("search_query is required for amazon_product_search template")
-        
-        actions = [
-            {
-                "type": "navigate",
-                "value": "https://www.amazon.com"
-            },
-            {
-                "type": "fill",
-                "selector": "input[name='field-keywords']",
-                "value": search_query
-            },
-            {
-                "type": "press_key",
-                "selector": "input[name='field-keywords']",
-                "value": "Enter"
-            },
-            {
-                "type": "wait_for_element",
-                "selector": ".s-result-item[data-component-type='s-search-result']",
-                "timeout": 10000
-            },
-            {
-                "type": "evaluate",
-                "value": f"""
+    names = node["$names"]
+    if len(names) > 1:
+        raise ValueError(f"Ambiguous template '{prefix}', matches: {', '.join(sorted(names))}")
+    return names[0]
+
+
+# Action type names, interned so every generated action shares one string
+_NAVIGATE = sys.intern("navigate")
+_FILL = sys.intern("fill")
+_PRESS_KEY = sys.intern("press_key")
+_WAIT_FOR_ELEMENT = sys.intern("wait_for_element")
+_WAIT = sys.intern("wait")
+_SCROLL = sys.intern("scroll")
+_EVALUATE = sys.intern("evaluate")
+_SCREENSHOT_TYPE = sys.intern("screenshot")
+
+def _minify_js(js: str) -> str:
+    """Collapse whitespace runs in a JS snippet (none of ours has multi-space string literals)"""
+    return re.sub(r"\s+", " ", js).strip()
+
+
+# %-format templates for the JS evaluate payloads, minified once at import;
+# only the numbers are filled in per call
+_AMAZON_JS_TMPL = _minify_js("""
                 Array.from(document.querySelectorAll('.s-result-item[data-component-type="s-search-result"]'))
-                    .slice(0, {max_results})
-                    .map(item => ({{
+                    .slice(0, %s)
+                    .map(item => ({
                         title: item.querySelector('h2 a span')?.innerText || '',
                         price: item.querySelector('.a-price-whole')?.innerText || 'N/A',
                         rating: item.querySelector('.a-icon-alt')?.innerText || 'N/A',
@@ -88,73 +91,53 @@ class TemplateManager:
                         url: item.querySelector('h2 a')?.href || '',
                         image: item.querySelector('img.s-image')?.src || '',
                         asin: item.getAttribute('data-asin') || ''
-                    }}))
-                """
-            },
-            {
-                "type": "screenshot"
-            }
-        ]
-        
-        return actions
-    
-    @staticmethod
-    def _google_search(params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Google search template"""
-        search_query = params.get("search_query", "")
-        max_results = params.get("max_results", 10)
-        
-        if not search_query:
-            raise ValueError("search_query is required for google_search template")
-        
-        return [
-            {
-                "type": "navigate",
-                "value": f"https://www.google.com/search?q={search_query}"
-            },
-            {
-                "type": "wait_for_element",
-                "selector": "#search",
-                "timeout": 10000
-            },
-            {
-                "type": "evaluate",
-                "value": f"""
+                    }))
+                """)
+
+_GOOGLE_JS_TMPL = _minify_js("""
                 Array.from(document.querySelectorAll('.g'))
-                    .slice(0, {max_results})
-                    .map(item => ({{
+                    .slice(0, %s)
+                    .map(item => ({
                         title: item.querySelector('h3')?.innerText || '',
                         url: item.querySelector('a')?.href || '',
                         description: item.querySelector('.VwiC3b')?.innerText || ''
-                    }}))
-                """
-            },
-            {
-                "type": "screenshot"
-            }
-        ]
-    
-    @staticmethod
-    def _linkedin_profile(params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """LinkedIn profile scraper template"""
-        profile_url = params.get("profile_url", "")
-        
-        if not profile_url:
-            raise ValueError("profile_url is required for linkedin_profile template")
-        
-        return [
-            {
-                "type": "navigate",
-                "value": profile_url
-            },
-            {
-                "type": "wait_for_element",
-                "selector": ".pv-top-card",
-                "timeout": 15000
-            },
-            {
-                "type": "evaluate",
-                "value": """
+                    }))
+                """)
+
+_TWITTER_JS_TMPL = _minify_js("""
+                Array.from(document.querySelectorAll('article'))
+                    .slice(0, %s)
+                    .map(tweet => ({
+                        text: tweet.querySelector('[data-testid="tweetText"]')?.innerText || '',
+                        timestamp: tweet.querySelector('time')?.getAttribute('datetime') || '',
+                        likes: tweet.querySelector('[data-testid="like"]')?.innerText || '0',
+                        retweets: tweet.querySelector('[data-testid="retweet"]')?.innerText || '0',
+                        replies: tweet.querySelector('[data-testid="reply"]')?.innerText || '0'
+                    }))
+                """)
+
+
+# Actions that never depend on template params, shared read-only by every call
+_SCREENSHOT = MappingProxyType({"type": _SCREENSHOT_TYPE})
+
+_AMAZON_NAVIGATE = MappingProxyType({"type": _NAVIGATE, "value": "https://www.amazon.com"})
+_AMAZON_PRESS_ENTER = MappingProxyType({
+    "type": _PRESS_KEY,
+    "selector": "input[name='field-keywords']",
+    "value": "Enter"
+})
+_AMAZON_WAIT_RESULTS = MappingProxyType({
+    "type": _WAIT_FOR_ELEMENT,
+    "selector": ".s-result-item[data-component-type='s-search-result']",
+    "timeout": 10000
+})
+
+_GOOGLE_WAIT_RESULTS = MappingProxyType({"type": _WAIT_FOR_ELEMENT, "selector": "#search", "timeout": 10000})
+
+_LINKEDIN_WAIT_PROFILE = MappingProxyType({"type": _WAIT_FOR_ELEMENT, "selector": ".pv-top-card", "timeout": 15000})
+_LINKEDIN_EXTRACT = MappingProxyType({
+    "type": _EVALUATE,
+    "value": _minify_js("""
                 {
                     name: document.querySelector('.pv-top-card--list li:first-child')?.innerText || '',
                     headline: document.querySelector('.pv-top-card--list li:nth-child(2)')?.innerText || '',
@@ -162,89 +145,18 @@ class TemplateManager:
                     connections: document.querySelector('.pv-top-card--list.pv-top-card--list-bullet li:nth-child(2)')?.innerText || '',
                     about: document.querySelector('.pv-about__summary-text')?.innerText || ''
                 }
-                """
-            },
-            {
-                "type": "screenshot"
-            }
-        ]
-    
-    @staticmethod
-    def _twitter_scrape(params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Twitter/X profile scraper template"""
-        username = params.get("username", "")
-        max_tweets = params.get("max_tweets", 10)
-        
-        if not username:
-            raise ValueError("username is required for twitter_scrape template")
-        
-        return [
-            {
-                "type": "navigate",
-                "value": f"https://twitter.com/{username}"
-            },
-            {
-                "type": "wait_for_element",
-                "selector": "article",
-                "timeout": 10000
-            },
-            {
-                "type": "scroll",
-                "value": "1000"
-            },
-            {
-                "type": "wait",
-                "value": "2000"
-            },
-            {
-                "type": "evaluate",
-                "value": f"""
-                Array.from(document.querySelectorAll('article'))
-                    .slice(0, {max_tweets})
-                    .map(tweet => ({{
-                        text: tweet.querySelector('[data-testid="tweetText"]')?.innerText || '',
-                        timestamp: tweet.querySelector('time')?.getAttribute('datetime') || '',
-                        likes: tweet.querySelector('[data-testid="like"]')?.innerText || '0',
-                        retweets: tweet.querySelector('[data-testid="retweet"]')?.innerText || '0',
-                        replies: tweet.querySelector('[data-testid="reply"]')?.innerText || '0'
-                    }}))
-                """
-            },
-            {
-                "type": "screenshot"
-            }
-        ]
-    
-    @staticmethod
-    def _google_maps_business(params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Google Maps business scraper template"""
-        search_query = params.get("search_query", "")
-        location = params.get("location", "")
-        
-        if not search_query:
-            raise ValueError("search_query is required for google_maps_business template")
-        
-        search_url = f"https://www.google.com/maps/search/{search_query}"
-        if location:
-            search_url += f"+{location}"
-        
-        return [
-            {
-                "type": "navigate",
-                "value": search_url
-            },
-            {
-                "type": "wait_for_element",
-                "selector": "[role='article']",
-                "timeout": 10000
-            },
-            {
-                "type": "wait",
-                "value": "3000"
-            },
-            {
-                "type": "evaluate",
-                "value": """
+                """)
+})
+
+_TWITTER_WAIT_ARTICLES = MappingProxyType({"type": _WAIT_FOR_ELEMENT, "selector": "article", "timeout": 10000})
+_TWITTER_SCROLL = MappingProxyType({"type": _SCROLL, "value": "1000"})
+_TWITTER_WAIT = MappingProxyType({"type": _WAIT, "value": "2000"})
+
+_MAPS_WAIT_RESULTS = MappingProxyType({"type": _WAIT_FOR_ELEMENT, "selector": "[role='article']", "timeout": 10000})
+_MAPS_WAIT = MappingProxyType({"type": _WAIT, "value": "3000"})
+_MAPS_EXTRACT = MappingProxyType({
+    "type": _EVALUATE,
+    "value": _minify_js("""
                 Array.from(document.querySelectorAll('[role="article"]'))
                     .slice(0, 20)
                     .map(item => ({
@@ -255,40 +167,247 @@ class TemplateManager:
                         type: item.querySelector('.W4Efsd:first-of-type')?.innerText || '',
                         phone: item.querySelector('[data-tooltip="Copy phone number"]')?.innerText || ''
                     }))
-                """
-            },
-            {
-                "type": "screenshot"
-            }
-        ]
+                """)
+})
+
+# A template's generated actions
+Actions = Tuple[Mapping[str, Any], ...]
+
+
+@dataclass(slots=True, frozen=True)
+class AmazonProductSearchParams:
+    """Parameters for amazon_product_search"""
+    search_query: str
+    max_results: int = 20
+    extract_reviews: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class GoogleSearchParams:
+    """Parameters for google_search"""
+    search_query: str
+    max_results: int = 10
+
+
+@dataclass(slots=True, frozen=True)
+class LinkedInProfileParams:
+    """Parameters for linkedin_profile"""
+    profile_url: str
+
+
+@dataclass(slots=True, frozen=True)
+class TwitterScrapeParams:
+    """Parameters for twitter_scrape"""
+    username: str
+    max_tweets: int = 10
+
+
+@dataclass(slots=True, frozen=True)
+class GoogleMapsBusinessParams:
+    """Parameters for google_maps_business"""
+    search_query: str
+    location: str = ""
+
+
+TemplateParams = Union[
+    AmazonProductSearchParams,
+    GoogleSearchParams,
+    LinkedInProfileParams,
+    TwitterScrapeParams,
+    GoogleMapsBusinessParams,
+]
+
+
+class TemplateManager:
+    """Manages pre-built templates"""
+    
+    @staticmethod
+    def get_template(template_type: str, params: Dict[str, Any]) -> Actions:
+        """Get actions for a specific template.
+        
+        template_type may also be an unambiguous prefix of a template name.
+        Results are cached per template and params, and shared between
+        calls, so every action is a read-only mapping.
+        """
+        template_type = _resolve_name(template_type)
+        
+        typed_params = TemplateManager._typed_params(template_type, params)
+        try:
+            hash(typed_params)
+        except TypeError:
+            # Unhashable parameter values (lists, dicts) can't be cached
+            return tuple(_DISPATCH[template_type](typed_params))
+        return TemplateManager._cached_template(template_type, typed_params)
+    
+    @staticmethod
+    def iter_template(template_type: str, params: Dict[str, Any]) -> Iterator[Mapping[str, Any]]:
+        """Generate a template's actions one at a time, without caching"""
+        template_type = _resolve_name(template_type)
+        return _DISPATCH[template_type](TemplateManager._typed_params(template_type, params))
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _cached_template(template_type: str, params: TemplateParams) -> Actions:
+        return tuple(_DISPATCH[template_type](params))
     
     @staticmethod
-    def list_templates() -> List[Dict[str, str]]:
+    def _typed_params(template_type: str, params: Dict[str, Any]) -> TemplateParams:
+        """Check required params and convert them to the template's params class"""
+        for key in _REQUIRED[template_type]:
+            if not params.get(key):
+                raise ValueError(f"{key} is required for {template_type} template")
+        
+        # Unrelated keys are ignored, as before
+        params_type = _PARAM_TYPES[template_type]
+        return params_type(**{k: v for k, v in params.items() if k in params_type.__dataclass_fields__})
+    
+    @staticmethod
+    def _amazon_product_search(params: AmazonProductSearchParams) -> Iterator[Mapping[str, Any]]:
+        """Amazon product search template"""
+        search_query = params.search_query
+        max_results = params.max_results
+        extract_reviews = params.extract_reviews
+        
+        yield _AMAZON_NAVIGATE
+        yield MappingProxyType({
+            "type": _FILL,
+            "selector": "input[name='field-keywords']",
+            "value": search_query
+        })
+        yield _AMAZON_PRESS_ENTER
+        yield _AMAZON_WAIT_RESULTS
+        yield MappingProxyType({
+            "type": _EVALUATE,
+            "value": _AMAZON_JS_TMPL % max_results
+        })
+        yield _SCREENSHOT
+    
+    @staticmethod
+    def _google_search(params: GoogleSearchParams) -> Iterator[Mapping[str, Any]]:
+        """Google search template"""
+        search_query = params.search_query
+        max_results = params.max_results
+        
+        yield MappingProxyType({
+            "type": _NAVIGATE,
+            "value": f"https://www.google.com/search?q={quote_plus(search_query)}"
+        })
+        yield _GOOGLE_WAIT_RESULTS
+        yield MappingProxyType({
+            "type": _EVALUATE,
+            "value": _GOOGLE_JS_TMPL % max_results
+        })
+        yield _SCREENSHOT
+    
+    @staticmethod
+    def _linkedin_profile(params: LinkedInProfileParams) -> Iterator[Mapping[str, Any]]:
+        """LinkedIn profile scraper template"""
+        profile_url = params.profile_url
+        
+        yield MappingProxyType({
+            "type": _NAVIGATE,
+            "value": profile_url
+        })
+        yield _LINKEDIN_WAIT_PROFILE
+        yield _LINKEDIN_EXTRACT
+        yield _SCREENSHOT
+    
+    @staticmethod
+    def _twitter_scrape(params: TwitterScrapeParams) -> Iterator[Mapping[str, Any]]:
+        """Twitter/X profile scraper template"""
+        username = params.username
+        max_tweets = params.max_tweets
+        
+        yield MappingProxyType({
+            "type": _NAVIGATE,
+            "value": f"https://twitter.com/{username}"
+        })
+        yield _TWITTER_WAIT_ARTICLES
+        yield _TWITTER_SCROLL
+        yield _TWITTER_WAIT
+        yield MappingProxyType({
+            "type": _EVALUATE,
+            "value": _TWITTER_JS_TMPL % max_tweets
+        })
+        yield _SCREENSHOT
+    
+    @staticmethod
+    def _google_maps_business(params: GoogleMapsBusinessParams) -> Iterator[Mapping[str, Any]]:
+        """Google Maps business scraper template"""
+        search_query = params.search_query
+        location = params.location
+        
+        search_url = f"https://www.google.com/maps/search/{quote_plus(search_query)}"
+        if location:
+            search_url += f"+{quote_plus(location)}"
+        
+        yield MappingProxyType({
+            "type": _NAVIGATE,
+            "value": search_url
+        })
+        yield _MAPS_WAIT_RESULTS
+        yield _MAPS_WAIT
+        yield _MAPS_EXTRACT
+        yield _SCREENSHOT
+    
+    @staticmethod
+    def list_templates() -> Tuple[Mapping[str, Any], ...]:
         """List all available templates"""
-        return [
-            {
-                "name": "amazon_product_search",
-                "description": "Search Amazon products and extract details",
-                "parameters": ["search_query", "max_results", "extract_reviews"]
-            },
-            {
-                "name": "google_search",
-                "description": "Perform Google search and extract results",
-                "parameters": ["search_query", "max_results"]
-            },
-            {
-                "name": "linkedin_profile",
-                "description": "Extract LinkedIn profile information",
-                "parameters": ["profile_url"]
-            },
-            {
-                "name": "twitter_scrape",
-                "description": "Scrape tweets from a Twitter/X profile",
-                "parameters": ["username", "max_tweets"]
-            },
-            {
-                "name": "google_maps_business",
-                "description": "Search and extract Google Maps business listings",
-                "parameters": ["search_query", "location"]
-            }
-        ]
+        return _TEMPLATE_INFO
+
+
+# Template name -> action builder
+_DISPATCH: Dict[str, Callable[[TemplateParams], Iterator[Mapping[str, Any]]]] = {
+    TemplateType.AMAZON_PRODUCT_SEARCH: TemplateManager._amazon_product_search,
+    TemplateType.GOOGLE_SEARCH: TemplateManager._google_search,
+    TemplateType.LINKEDIN_PROFILE: TemplateManager._linkedin_profile,
+    TemplateType.TWITTER_SCRAPE: TemplateManager._twitter_scrape,
+    TemplateType.GOOGLE_MAPS_BUSINESS: TemplateManager._google_maps_business,
+}
+
+# Template name -> params class its builder takes
+_PARAM_TYPES: Dict[str, type] = {
+    TemplateType.AMAZON_PRODUCT_SEARCH: AmazonProductSearchParams,
+    TemplateType.GOOGLE_SEARCH: GoogleSearchParams,
+    TemplateType.LINKEDIN_PROFILE: LinkedInProfileParams,
+    TemplateType.TWITTER_SCRAPE: TwitterScrapeParams,
+    TemplateType.GOOGLE_MAPS_BUSINESS: GoogleMapsBusinessParams,
+}
+
+# Params each template can't run without, checked before its builder is called
+_REQUIRED: Dict[str, Tuple[str, ...]] = {
+    TemplateType.AMAZON_PRODUCT_SEARCH: ("search_query",),
+    TemplateType.GOOGLE_SEARCH: ("search_query",),
+    TemplateType.LINKEDIN_PROFILE: ("profile_url",),
+    TemplateType.TWITTER_SCRAPE: ("username",),
+    TemplateType.GOOGLE_MAPS_BUSINESS: ("search_query",),
+}
+
+# Built once; list_templates hands out the same read-only descriptions
+_TEMPLATE_INFO: Tuple[Mapping[str, Any], ...] = (
+    MappingProxyType({
+        "name": TemplateType.AMAZON_PRODUCT_SEARCH,
+        "description": "Search Amazon products and extract details",
+        "parameters": ("search_query", "max_results", "extract_reviews")
+    }),
+    MappingProxyType({
+        "name": TemplateType.GOOGLE_SEARCH,
+        "description": "Perform Google search and extract results",
+        "parameters": ("search_query", "max_results")
+    }),
+    MappingProxyType({
+        "name": TemplateType.LINKEDIN_PROFILE,
+        "description": "Extract LinkedIn profile information",
+        "parameters": ("profile_url",)
+    }),
+    MappingProxyType({
+        "name": TemplateType.TWITTER_SCRAPE,
+        "description": "Scrape tweets from a Twitter/X profile",
+        "parameters": ("username", "max_tweets")
+    }),
+    MappingProxyType({
+        "name": TemplateType.GOOGLE_MAPS_BUSINESS,
+        "description": "Search and extract Google Maps business listings",
+        "parameters": ("search_query", "location")
+    }),
+)